@@ -0,0 +1,158 @@
+# Adaptive sampling for plotting functions
+# Instead of a fixed np.linspace, start from a coarse grid and keep splitting the
+# intervals where the curve bends the most, until the error is small or the
+# point budget runs out. Refined grids are cached per function and range, and
+# samples from the previous range are reused when the range only moves a bit.
+
+import math
+
+import numpy as np
+
+# --- Caches ---
+# (f, xmin, xmax, budget, init, tol, derivs) -> (x, y)
+_grid_cache = {}
+_GRID_CACHE_SIZE = 32
+# f -> (x, y) of the last grid computed for that function
+_last_samples = {}
+
+
+def _chord_error(x, y):
+    # Distance of each interior point from the chord through its neighbours,
+    # scaled by the size of the curve so the tolerance is relative. Using the
+    # magnitude as well as the spread keeps round-off on a (nearly) constant
+    # curve, like the third derivative of a cubic, from looking like detail.
+    scale = max(np.ptp(y), np.max(np.abs(y)))
+    if not np.isfinite(scale) or scale == 0.0:
+        return np.zeros(len(x) - 2)
+    t = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+    chord = y[:-2] + t*(y[2:] - y[:-2])
+    err = np.abs(y[1:-1] - chord) / scale
+    return np.nan_to_num(err, nan=np.inf)
+
+
+def derivatives(x, y, order):
+    """First `order` derivatives of sampled data on a (possibly uneven) grid.
+
+    Fits a small polynomial through the neighbours of every point, so each
+    derivative is estimated directly instead of by repeated np.gradient, which
+    gets noisy wherever the grid spacing changes.
+    """
+    n = len(x)
+    w = min(order + 2 if order % 2 else order + 3, n)  # odd, centred stencil
+    start = np.clip(np.arange(n) - w//2, 0, n - w)
+    s = start[:, None] + np.arange(w)
+    # Scale offsets to [-1, 1]-ish so the small system stays well conditioned
+    h = x[s[:, -1]] - x[s[:, 0]]
+    u = (x[s] - x[:, None]) / h[:, None]
+    V = u[:, :, None] ** np.arange(w)
+    c = np.linalg.solve(V, y[s][:, :, None])[:, :, 0]
+    return [c[:, k]*math.factorial(k)/h**k for k in range(1, order + 1)]
+
+
+def _interval_error(x, y, derivs):
+    # Error for each interval = worst chord error at its two end points,
+    # taken over f and its first `derivs` numerical derivatives.
+    curves = [y]
+    if derivs > 0:
+        curves += derivatives(x, y, derivs)
+    curve_err = np.zeros(len(x) - 2)
+    for cur in curves:
+        curve_err = np.maximum(curve_err, _chord_error(x, cur))
+    err = np.zeros(len(x) - 1)
+    err[:-1] = curve_err
+    err[1:] = np.maximum(err[1:], curve_err)
+    return err
+
+
+def _unbalanced(x):
+    # Intervals more than twice as wide as a neighbour. Splitting these keeps the
+    # spacing smooth so the derivative stencils stay accurate.
+    w = np.diff(x)
+    bad = np.zeros(len(w), dtype=bool)
+    bad[:-1] |= w[:-1] > 2.0*w[1:]
+    bad[1:] |= w[1:] > 2.0*w[:-1]
+    return bad
+
+
+def _insert_midpoints(f, x, y, split):
+    # Split the selected intervals in half; f is only evaluated at the new points.
+    idx = np.nonzero(split)[0]
+    xm = 0.5*(x[idx] + x[idx + 1])
+    ym = np.asarray(f(xm), dtype=float)
+    x = np.insert(x, idx + 1, xm)
+    y = np.insert(y, idx + 1, ym)
+    return x, y
+
+
+def _pick(err, mask, room):
+    # Keep at most `room` of the masked intervals, largest error first.
+    idx = np.nonzero(mask)[0]
+    if len(idx) > room:
+        idx = idx[np.argsort(err[idx])[::-1][:room]]
+    split = np.zeros(len(mask), dtype=bool)
+    split[idx] = True
+    return split
+
+
+def _seed_grid(f, xmin, xmax, init):
+    # Start from the previous grid for this function when it covers most of the
+    # new range, then fill any gap wider than the coarse spacing.
+    h0 = (xmax - xmin) / (init - 1)
+    x_old = np.empty(0)
+    y_old = np.empty(0)
+    prev = _last_samples.get(f)
+    if prev is not None:
+        px, py = prev
+        overlap = min(xmax, px[-1]) - max(xmin, px[0])
+        if overlap >= 0.5*max(xmax - xmin, px[-1] - px[0]):
+            keep = (px > xmin) & (px < xmax)
+            x_old, y_old = px[keep], py[keep]
+
+    x = np.concatenate(([xmin], x_old, [xmax]))
+    known = np.concatenate(([False], np.ones(len(x_old), dtype=bool), [False]))
+    gaps = np.maximum(np.ceil(np.diff(x) / h0 - 1e-9).astype(int), 1)
+    pieces = [x[i] + (x[i + 1] - x[i])*np.arange(n)/n for i, n in enumerate(gaps)]
+    known_pieces = [np.concatenate(([known[i]], np.zeros(n - 1, dtype=bool)))
+                    for i, n in enumerate(gaps)]
+    x_new = np.concatenate(pieces + [[xmax]])
+    known_new = np.concatenate(known_pieces + [[False]])
+
+    y_new = np.empty(len(x_new))
+    y_new[known_new] = y_old
+    y_new[~known_new] = f(x_new[~known_new])
+    return x_new, y_new
+
+
+def adaptive_sample(f, xmin, xmax, budget=400, init=65, tol=1e-3, derivs=0):
+    """Sample f on [xmin, xmax], refining where the curve bends.
+
+    Returns (x, y) with at most about `budget` points. Set `derivs` to also
+    refine on the first `derivs` numerical derivatives of f.
+    """
+    key = (f, xmin, xmax, budget, init, tol, derivs)
+    cached = _grid_cache.get(key)
+    if cached is not None:
+        return cached
+
+    x, y = _seed_grid(f, xmin, xmax, init)
+    while len(x) < budget:
+        room = budget - len(x)
+        err = _interval_error(x, y, derivs)
+        split = _pick(err, err > tol, room)
+        if not split.any():
+            break
+        x, y = _insert_midpoints(f, x, y, split)
+        # Smooth out the spacing around the new points (bounded by the budget)
+        while len(x) < budget:
+            bad = _unbalanced(x)
+            if not bad.any():
+                break
+            x, y = _insert_midpoints(f, x, y, _pick(np.diff(x), bad, budget - len(x)))
+
+    x.flags.writeable = False
+    y.flags.writeable = False
+    _last_samples[f] = (x, y)
+    if len(_grid_cache) >= _GRID_CACHE_SIZE:
+        _grid_cache.pop(next(iter(_grid_cache)))
+    _grid_cache[key] = (x, y)
+    return x, y
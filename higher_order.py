@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 matplotlib.use('TkAgg')
 from matplotlib.widgets import RadioButtons, Slider
 import time
+from adaptive_sampling import adaptive_sample, derivatives
 
 # --- Preset functions to keep things simple ---
 def f_poly(x):
@@ -26,22 +27,20 @@ FUNCTIONS = {
     "exp(-x^2)": f_gauss,
 }
 
-def compute_all_derivatives(f, x):
-    y = f(x)
-    # Numerical derivatives using gradients for simplicity
-    y1 = np.gradient(y, x)
-    y2 = np.gradient(y1, x)
-    y3 = np.gradient(y2, x)
-    return y, y1, y2, y3
+def compute_all_derivatives(f, xmin, xmax):
+    # Adaptive grid refined on f and its derivatives (cached per function/range)
+    x, y = adaptive_sample(f, xmin, xmax, derivs=3)
+    # Numerical derivatives from local polynomial fits (grid is not uniform)
+    y1, y2, y3 = derivatives(x, y, 3)
+    return x, y, y1, y2, y3
 
 def main():
     # Initial settings
     xmin, xmax = -5.0, 5.0
-    x = np.linspace(xmin, xmax, 1200)
     f = FUNCTIONS["x^3 - 3x"]
 
     # Compute
-    y, y1, y2, y3 = compute_all_derivatives(f, x)
+    x, y, y1, y2, y3 = compute_all_derivatives(f, xmin, xmax)
 
     # Plot
     fig, ax = plt.subplots(figsize=(8, 5))
@@ -67,13 +66,13 @@ def main():
     smin = Slider(smin_ax, "xmin", -10.0, 0.0, valinit=xmin)
     smax = Slider(smax_ax, "xmax",  0.0, 10.0, valinit=xmax)
 
-    def update_plot(cur_f, xnew):
-        y, y1, y2, y3 = compute_all_derivatives(cur_f, xnew)
+    def update_plot(cur_f, xmin_cur, xmax_cur):
+        xnew, y, y1, y2, y3 = compute_all_derivatives(cur_f, xmin_cur, xmax_cur)
         line_f.set_data(xnew, y)
         line_d1.set_data(xnew, y1)
         line_d2.set_data(xnew, y2)
         line_d3.set_data(xnew, y3)
-        ax.set_xlim(xnew.min(), xnew.max())
+        ax.set_xlim(xmin_cur, xmax_cur)
         ax.relim()
         ax.autoscale_view(scalex=False, scaley=True)
         fig.canvas.draw_idle()
@@ -82,16 +81,14 @@ def main():
         cur_f = FUNCTIONS[label]
         xmin_cur = min(smin.val, smax.val - 1e-6)
         xmax_cur = max(smax.val, smin.val + 1e-6)
-        xnew = np.linspace(xmin_cur, xmax_cur, 1200)
-        update_plot(cur_f, xnew)
+        update_plot(cur_f, xmin_cur, xmax_cur)
 
     def on_slider(_):
         xmin_cur = min(smin.val, smax.val - 1e-6)
         xmax_cur = max(smax.val, smin.val + 1e-6)
-        xnew = np.linspace(xmin_cur, xmax_cur, 1200)
         cur_label = radio.value_selected
         cur_f = FUNCTIONS[cur_label]
-        update_plot(cur_f, xnew)
+        update_plot(cur_f, xmin_cur, xmax_cur)
 
     radio.on_clicked(on_radio)
     smin.on_changed(on_slider)
@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 matplotlib.use('TkAgg')
 from matplotlib.widgets import Slider
 import time
+from adaptive_sampling import adaptive_sample
 
 # --- Function definition (simple default) ---
 def f(x):
@@ -21,7 +22,6 @@ def df(x, h=1e-5):
 def main():
     # --- Domain for plotting ---
     xmin, xmax = -5.0, 5.0
-    x = np.linspace(xmin, xmax, 800)
 
     # --- Get an initial point from the user (fallback to 0.0 if invalid) ---
     try:
@@ -33,8 +33,8 @@ def main():
     # Clamp x0 into the plotting window
     x0 = max(min(x0, xmax), xmin)
 
-    # --- Initial computations ---
-    y = f(x)
+    # --- Initial computations (adaptive grid: dense only where f bends) ---
+    x, y = adaptive_sample(f, xmin, xmax)
     m = df(x0)
     y0 = f(x0)
     tangent = m*(x - x0) + y0